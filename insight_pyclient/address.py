@@ -7,6 +7,10 @@
 
 import json
 
+from .serialization import packb, unpack_fields, DECODING_ERRORS, hex_to_bytes, bytes_to_hex
+from .exception import ParamException
+from .utils import satoshi_to_bitcoin
+
 
 class Address(object):
     """
@@ -27,6 +31,10 @@ class Address(object):
     @type transactions: [String]
     """
 
+    __slots__ = ("address", "balance", "balanceSat", "totalReceived", "totalReceivedSat", "totalSent", "totalSentSat",
+                 "unconfirmedBalance", "unconfirmedBalanceSat", "unconfirmedTxAppearances", "txAppearances",
+                 "transactions")
+
     def __init__(self, string_json):
         parsed = json.loads(string_json)
         self.address = parsed["addrStr"]
@@ -45,6 +53,54 @@ class Address(object):
         else:
             self.transactions = None
 
+    def __getstate__(self):
+        return (self.address, self.balance, self.balanceSat, self.totalReceived, self.totalReceivedSat, self.totalSent,
+                self.totalSentSat, self.unconfirmedBalance, self.unconfirmedBalanceSat, self.unconfirmedTxAppearances,
+                self.txAppearances, self.transactions)
+
+    def __setstate__(self, state):
+        (self.address, self.balance, self.balanceSat, self.totalReceived, self.totalReceivedSat, self.totalSent,
+         self.totalSentSat, self.unconfirmedBalance, self.unconfirmedBalanceSat, self.unconfirmedTxAppearances,
+         self.txAppearances, self.transactions) = state
+
+    def to_bytes(self):
+        """
+        Encodes the address, the amounts are only stored as satoshis and the transactions hashes as raw bytes
+        @return: The encoded address
+        @rtype: bytes
+        """
+        transactions = None
+        if self.transactions is not None:
+            transactions = [hex_to_bytes(txid) for txid in self.transactions]
+        return packb([self.address, self.balanceSat, self.totalReceivedSat, self.totalSentSat,
+                      self.unconfirmedBalanceSat, self.unconfirmedTxAppearances, self.txAppearances, transactions])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        @param data: An address encoded by to_bytes
+        @type data: bytes
+        @return: The decoded address
+        @rtype: Address
+        """
+        fields = unpack_fields(data, 8, "address")
+        try:
+            address = cls.__new__(cls)
+            address.address = fields[0]
+            (address.balanceSat, address.totalReceivedSat, address.totalSentSat,
+             address.unconfirmedBalanceSat) = fields[1:5]
+            address.balance = satoshi_to_bitcoin(address.balanceSat)
+            address.totalReceived = satoshi_to_bitcoin(address.totalReceivedSat)
+            address.totalSent = satoshi_to_bitcoin(address.totalSentSat)
+            address.unconfirmedBalance = satoshi_to_bitcoin(address.unconfirmedBalanceSat)
+            address.unconfirmedTxAppearances, address.txAppearances = fields[5:7]
+            address.transactions = None
+            if fields[7] is not None:
+                address.transactions = [bytes_to_hex(txid) for txid in fields[7]]
+        except DECODING_ERRORS:
+            raise ParamException("The given data is not an encoded address")
+        return address
+
 
 class UnspentOutput(object):
     """
@@ -60,6 +116,8 @@ class UnspentOutput(object):
     @type height: Int (Nullable)
     """
 
+    __slots__ = ("address", "txid", "vout", "scriptPubKey", "amount", "satoshis", "confirmations", "ts", "height")
+
     def __init__(self, parsed_json):
         self.address = parsed_json['address']
         self.txid = parsed_json['txid']
@@ -76,3 +134,41 @@ class UnspentOutput(object):
             self.height = parsed_json["height"]
         else:
             self.height = None
+
+    def __getstate__(self):
+        return (self.address, self.txid, self.vout, self.scriptPubKey, self.amount, self.satoshis, self.confirmations,
+                self.ts, self.height)
+
+    def __setstate__(self, state):
+        (self.address, self.txid, self.vout, self.scriptPubKey, self.amount, self.satoshis, self.confirmations,
+         self.ts, self.height) = state
+
+    def to_bytes(self):
+        """
+        Encodes the output, the amount is only stored as satoshis and the hashes as raw bytes
+        @return: The encoded output
+        @rtype: bytes
+        """
+        return packb([self.address, hex_to_bytes(self.txid), self.vout, hex_to_bytes(self.scriptPubKey),
+                      self.satoshis, self.confirmations, self.ts, self.height])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        @param data: An output encoded by to_bytes
+        @type data: bytes
+        @return: The decoded output
+        @rtype: UnspentOutput
+        """
+        fields = unpack_fields(data, 8, "unspent output")
+        try:
+            output = cls.__new__(cls)
+            output.address = fields[0]
+            output.txid = bytes_to_hex(fields[1])
+            output.vout = fields[2]
+            output.scriptPubKey = bytes_to_hex(fields[3])
+            output.satoshis, output.confirmations, output.ts, output.height = fields[4:8]
+            output.amount = satoshi_to_bitcoin(output.satoshis)
+        except DECODING_ERRORS:
+            raise ParamException("The given data is not an encoded unspent output")
+        return output
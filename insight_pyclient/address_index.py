@@ -0,0 +1,262 @@
+# -*- coding:Utf-8 -*
+"""
+@author: Thibault de Balthasar
+@contact: contact (at) thibaultdebalt [.] fr
+@license: GNU GENERAL PUBLIC LICENSE Version 3
+"""
+
+import binascii
+import struct
+import threading
+import zlib
+
+from .exception import ParamException
+from .utils import satoshi_to_bitcoin, bitcoin_to_satoshi
+
+
+class AddressIndex(object):
+    """
+    An inverted index going from a bitcoin address to the transactions it appears in. It is fed with the transactions \
+    loaded from the API, so that the history and the gain of an address can be computed without any new request.
+
+    The txids are stored once as raw 32 bytes values and referenced by their position from the addresses, the gains \
+    are stored in satoshis. The index can be fed and queried from several threads at once.
+
+    @ivar _txids: The raw txids known by the index, the position in the list is used as an identifier
+    @type _txids: [bytes]
+    @ivar _times: The timestamp of each transaction, at the same position as in _txids
+    @type _times: [Int]
+    @ivar _positions: Gives the position of a raw txid in _txids
+    @type _positions: {bytes: Int}
+    @ivar _addresses: For each address, the gain in satoshis for every transaction position it appears in
+    @type _addresses: {String: {Int: Int}}
+    """
+
+    MAGIC = b"IPAI"
+    FORMAT_VERSION = 1
+
+    def __init__(self):
+        self._txids = []
+        self._times = []
+        self._positions = {}
+        self._addresses = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._addresses)
+
+    def __contains__(self, address):
+        return address in self._addresses
+
+    def add_transaction(self, transaction):
+        """
+        Adds the given transaction to the index. Adding the same transaction again only refreshes what was known about \
+        it, so it can be called for every transaction loaded without caring about duplicates.
+        @param transaction: The transaction to index
+        @type transaction: Transaction
+        """
+        deltas = {}
+        for inp in transaction.inputs:
+            if inp.addr is not None:
+                deltas[inp.addr] = deltas.get(inp.addr, 0) - inp.valueSat
+        for out in transaction.outputs:
+            value = bitcoin_to_satoshi(out.value)
+            for address in out.scriptPubKey.addresses or []:
+                deltas[address] = deltas.get(address, 0) + value
+
+        raw_txid = binascii.unhexlify(transaction.txid)
+        timestamp = transaction.timestamp
+        with self._lock:
+            position = self._positions.get(raw_txid)
+            if position is None:
+                position = len(self._txids)
+                self._positions[raw_txid] = position
+                self._txids.append(raw_txid)
+                self._times.append(timestamp)
+            else:
+                self._times[position] = timestamp
+
+            for address, delta in deltas.items():
+                self._addresses.setdefault(address, {})[position] = delta
+
+    def add_transactions(self, transactions):
+        """
+        @param transactions: The transactions to index
+        @type transactions: [Transaction]
+        """
+        with self._lock:
+            for transaction in transactions:
+                self.add_transaction(transaction)
+
+    def get_transactions(self, address):
+        """
+        @param address: The address we wish to get the transactions from
+        @type address: String
+        @return: The hashes of the known transactions involving the address, ordered by time
+        @rtype: [String]
+        """
+        return [txid for txid, _, _ in self.get_history(address, True)]
+
+    def get_history(self, address, in_satoshis=False):
+        """
+        @param address: The address we wish to get the history from
+        @type address: String
+        @param in_satoshis: If we want to get the gains in Satoshis, False by default
+        @type in_satoshis: Boolean
+        @return: For each known transaction of the address its hash, its timestamp and the sum gained or lost, ordered \
+        by time
+        @rtype: [(String, Int, Float if we returns Bitcoins, else Int)]
+        """
+        history = []
+        with self._lock:
+            for position, delta in self._addresses.get(address, {}).items():
+                if not in_satoshis:
+                    delta = satoshi_to_bitcoin(delta)
+                txid = binascii.hexlify(self._txids[position]).decode("ascii")
+                history.append((txid, self._times[position], delta))
+        history.sort(key=lambda entry: entry[1])
+        return history
+
+    def get_net_gain(self, address, in_satoshis=False):
+        """
+        @param address: The address we wish to get the gain from
+        @type address: String
+        @param in_satoshis: If we want to get the result in Satoshis, False by default
+        @type in_satoshis: Boolean
+        @return: The sum gained or lost by the address over all the known transactions
+        @rtype: Float if we returns Bitcoins, else Int
+        """
+        with self._lock:
+            total = sum(self._addresses.get(address, {}).values())
+        if in_satoshis:
+            return total
+        return satoshi_to_bitcoin(total)
+
+    def to_bytes(self):
+        """
+        Encodes the index. The transactions table is written first, then each address followed by its (position, gain) \
+        pairs. The integers are written as variable length integers and the whole is compressed.
+        @return: The encoded index
+        @rtype: bytes
+        """
+        with self._lock:
+            chunks = [struct.pack(">4sB", self.MAGIC, self.FORMAT_VERSION), _encode_varint(len(self._txids))]
+            for raw_txid, timestamp in zip(self._txids, self._times):
+                chunks.append(raw_txid)
+                chunks.append(_encode_varint(_zigzag(timestamp)))
+            chunks.append(_encode_varint(len(self._addresses)))
+            for address, deltas in self._addresses.items():
+                encoded_address = address.encode("ascii")
+                chunks.append(_encode_varint(len(encoded_address)))
+                chunks.append(encoded_address)
+                chunks.append(_encode_varint(len(deltas)))
+                previous = 0
+                for position in sorted(deltas):
+                    chunks.append(_encode_varint(position - previous))
+                    chunks.append(_encode_varint(_zigzag(deltas[position])))
+                    previous = position
+        return zlib.compress(b"".join(chunks))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        @param data: An index encoded by to_bytes
+        @type data: bytes
+        @return: The decoded index
+        @rtype: AddressIndex
+        """
+        try:
+            data = bytearray(zlib.decompress(data))
+        except zlib.error:
+            raise ParamException("The given data is not an encoded address index")
+        if len(data) < 5 or bytes(data[:4]) != cls.MAGIC or data[4] != cls.FORMAT_VERSION:
+            raise ParamException("The given data is not an encoded address index")
+        try:
+            return cls._decode(data)
+        except (IndexError, ValueError):
+            raise ParamException("The given data is not an encoded address index")
+
+    @classmethod
+    def _decode(cls, data):
+        index = cls()
+        offset = 5
+        count, offset = _decode_varint(data, offset)
+        for position in range(count):
+            raw_txid = bytes(_read(data, offset, 32))
+            timestamp, offset = _decode_varint(data, offset + 32)
+            index._positions[raw_txid] = position
+            index._txids.append(raw_txid)
+            index._times.append(_unzigzag(timestamp))
+        count, offset = _decode_varint(data, offset)
+        for _ in range(count):
+            length, offset = _decode_varint(data, offset)
+            address = bytes(_read(data, offset, length)).decode("ascii")
+            offset += length
+            pairs, offset = _decode_varint(data, offset)
+            deltas = {}
+            position = 0
+            for _ in range(pairs):
+                gap, offset = _decode_varint(data, offset)
+                delta, offset = _decode_varint(data, offset)
+                position += gap
+                if position >= len(index._txids):
+                    raise ValueError("Unknown transaction position")
+                deltas[position] = _unzigzag(delta)
+            index._addresses[address] = deltas
+        if offset != len(data):
+            raise ValueError("Unexpected trailing data")
+        return index
+
+    def save(self, path):
+        """
+        @param path: The file to write the index to
+        @type path: String
+        """
+        with open(path, "wb") as output_file:
+            output_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        @param path: The file written by save
+        @type path: String
+        @return: The loaded index
+        @rtype: AddressIndex
+        """
+        with open(path, "rb") as input_file:
+            return cls.from_bytes(input_file.read())
+
+
+def _zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def _encode_varint(value):
+    encoded = bytearray()
+    while value > 0x7f:
+        encoded.append((value & 0x7f) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _read(data, offset, length):
+    if offset + length > len(data):
+        raise IndexError("Truncated data")
+    return data[offset:offset + length]
+
+
+def _decode_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
@@ -8,6 +8,12 @@
 import json
 import datetime
 
+from .serialization import packb, unpack_fields, DECODING_ERRORS, hex_to_bytes, bytes_to_hex, timestamp_to_datetime
+from .exception import ParamException
+from .utils import satoshi_to_bitcoin, bitcoin_to_satoshi
+
+_EMPTY_TIME = datetime.datetime(1000, 1, 1)
+
 
 class Block(object):
     """
@@ -25,6 +31,8 @@ class Block(object):
     @type tx: [String]
     @ivar time: The time of mining
     @type time: datetime
+    @ivar timestamp: The time of mining as given by the API, in seconds since the epoch
+    @type timestamp: nullable Integer
     @ivar nonce: The nonce of the block
     @type nonce: Integer
     @ivar bits: The bits of the block
@@ -54,50 +62,60 @@ class Block(object):
     @type partOfSummary: nullable Boolean
     """
 
-    def __init__(self, json_string):
+    __slots__ = ("hash", "size", "height", "version", "tx", "time", "timestamp", "nonce", "bits", "difficulty", "chainWork",
+                 "confirmations", "previousBlockHash", "nextBlockHash", "reward", "isMainChain", "poolName", "poolUrl",
+                 "partOfSummary", "txLength")
+
+    def __init__(self, json_string=None):
+        """
+        :param json_string: The block returned by the API, if not given an empty block is created
+        """
+        if json_string is None:
+            self.hash = ""
+            self.size = 0
+            self.height = 0
+            self.version = 0
+            self.tx = []
+            self.time = _EMPTY_TIME
+            self.timestamp = None
+            self.nonce = 0
+            self.bits = ""
+            self.difficulty = 0
+            self.chainWork = ""
+            self.confirmations = 0
+            self.previousBlockHash = ""
+            self.nextBlockHash = ""
+            self.reward = 0
+            self.isMainChain = False
+            self.poolName = ""
+            self.poolUrl = ""
+            self.partOfSummary = False
+            self.txLength = 0
+            return
         parsed = json.loads(json_string)
         self.hash = parsed["hash"]
         self.size = parsed["size"]
         self.height = parsed["height"]
         self.version = parsed["version"]
         self.tx = parsed["tx"]
-        self.time = datetime.datetime.fromtimestamp(parsed['time'])
+        self.timestamp = parsed['time']
+        self.time = datetime.datetime.fromtimestamp(self.timestamp)
         self.nonce = parsed["nonce"]
         self.bits = parsed["bits"]
         self.difficulty = parsed["difficulty"]
         self.chainWork = parsed["chainwork"]
         self.confirmations = parsed["confirmations"]
-        self.previousBlockHash = parsed["previousblockhash"]
-        self.nextBlockHash = parsed["nextblockhash"]
+        self.previousBlockHash = parsed.get("previousblockhash", "")
+        self.nextBlockHash = parsed.get("nextblockhash", "")
         self.reward = parsed["reward"]
         self.isMainChain = parsed["isMainChain"]
-        self.poolName = parsed["poolInfo"]["poolName"]
-        self.poolUrl = parsed["poolInfo"]["url"]
+        pool_info = parsed.get("poolInfo") or {}
+        self.poolName = pool_info.get("poolName", "")
+        self.poolUrl = pool_info.get("url", "")
 
         self.partOfSummary = False
         self.txLength = 0
 
-    def __init__(self):
-        self.hash = ""
-        self.size = 0
-        self.height = 0
-        self.version = 0
-        self.tx = []
-        self.time = datetime.datetime(1000, 1, 1)
-        self.nonce = 0
-        self.bits = ""
-        self.difficulty = 0
-        self.chainWork = ""
-        self.confirmations = 0
-        self.previousBlockHash = ""
-        self.nextBlockHash = ""
-        self.reward = 0
-        self.isMainChain = False
-        self.poolName = ""
-        self.poolUrl = ""
-        self.partOfSummary = False
-        self.txLength = 0
-
     def parse_summary(self, loaded_json):
         """
         Used with get_block_summaries to get a light version
@@ -108,13 +126,70 @@ class Block(object):
         self.hash = loaded_json["hash"]
         self.size = loaded_json["size"]
         self.txLength = loaded_json["txlength"]
-        self.time = datetime.datetime.fromtimestamp(loaded_json['time'])
+        self.timestamp = loaded_json['time']
+        self.time = datetime.datetime.fromtimestamp(self.timestamp)
         if "poolInfo" in loaded_json:
             if "poolName" in loaded_json["poolInfo"]:
                 self.poolName = loaded_json["poolInfo"]["poolName"]
             if "url" in loaded_json["poolInfo"]:
                 self.poolUrl = loaded_json["poolInfo"]["url"]
 
+    def __getstate__(self):
+        """
+        The state used by pickle is made of plain values only, the time is rebuilt from the timestamp
+        """
+        return (self.hash, self.size, self.height, self.version, self.tx, self.timestamp, self.nonce, self.bits,
+                self.difficulty, self.chainWork, self.confirmations, self.previousBlockHash, self.nextBlockHash,
+                self.reward, self.isMainChain, self.poolName, self.poolUrl, self.partOfSummary, self.txLength)
+
+    def __setstate__(self, state):
+        (self.hash, self.size, self.height, self.version, self.tx, self.timestamp, self.nonce, self.bits,
+         self.difficulty, self.chainWork, self.confirmations, self.previousBlockHash, self.nextBlockHash, self.reward,
+         self.isMainChain, self.poolName, self.poolUrl, self.partOfSummary, self.txLength) = state
+        self.time = _EMPTY_TIME if self.timestamp is None else timestamp_to_datetime(self.timestamp)
+
+    def to_bytes(self):
+        """
+        Encodes the block, the hashes are stored as raw bytes and the reward as satoshis
+        @return: The encoded block
+        @rtype: bytes
+        """
+        return packb([hex_to_bytes(self.hash), self.size, self.height, self.version,
+                      [hex_to_bytes(tx_hash) for tx_hash in self.tx], self.timestamp, self.nonce,
+                      hex_to_bytes(self.bits), self.difficulty, hex_to_bytes(self.chainWork), self.confirmations,
+                      hex_to_bytes(self.previousBlockHash), hex_to_bytes(self.nextBlockHash),
+                      bitcoin_to_satoshi(self.reward), self.isMainChain, self.poolName, self.poolUrl,
+                      self.partOfSummary, self.txLength])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        @param data: A block encoded by to_bytes
+        @type data: bytes
+        @return: The decoded block
+        @rtype: Block
+        """
+        fields = unpack_fields(data, 19, "block")
+        try:
+            block = cls.__new__(cls)
+            block.hash = bytes_to_hex(fields[0])
+            block.size, block.height, block.version = fields[1:4]
+            block.tx = [bytes_to_hex(tx_hash) for tx_hash in fields[4]]
+            block.timestamp = fields[5]
+            block.time = _EMPTY_TIME if block.timestamp is None else timestamp_to_datetime(block.timestamp)
+            block.nonce = fields[6]
+            block.bits = bytes_to_hex(fields[7])
+            block.difficulty = fields[8]
+            block.chainWork = bytes_to_hex(fields[9])
+            block.confirmations = fields[10]
+            block.previousBlockHash = bytes_to_hex(fields[11])
+            block.nextBlockHash = bytes_to_hex(fields[12])
+            block.reward = satoshi_to_bitcoin(fields[13])
+            block.isMainChain, block.poolName, block.poolUrl, block.partOfSummary, block.txLength = fields[14:19]
+        except DECODING_ERRORS:
+            raise ParamException("The given data is not an encoded block")
+        return block
+
 
 class BlockSummaryPagination(object):
     """
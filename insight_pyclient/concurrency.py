@@ -0,0 +1,142 @@
+# -*- coding:Utf-8 -*
+"""
+@author: Thibault de Balthasar
+@contact: contact (at) thibaultdebalt [.] fr
+@license: GNU GENERAL PUBLIC LICENSE Version 3
+"""
+
+import collections
+import threading
+import time
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    Limits the number of requests made at the same time to the API. The limit is increased by one each time a whole \
+    limit of requests succeeded with a healthy latency while all of the limit was in use, and it is multiplied by \
+    decrease_factor when a request times out or gets a 429 or 5xx answer (additive increase, multiplicative decrease).
+
+    @ivar min_limit: The limit will never go below this value
+    @type min_limit: Int
+    @ivar max_limit: The limit will never go above this value, it is also the number of threads used by the bulk methods
+    @type max_limit: Int
+    @ivar decrease_factor: The limit is multiplied by this value on failure
+    @type decrease_factor: Float
+    @ivar latency_tolerance: The limit is not increased while the latency is above the best latency observed \
+    multiplied by this value
+    @type latency_tolerance: Float
+    @ivar cooldown: The minimum time (seconds) between two decreases, so that the failures of the requests made at the \
+    same time only count once
+    @type cooldown: Float
+    @ivar latency: The average latency (seconds) of the successful requests
+    @type latency: Float
+    @ivar decisions: The last changes of the limit, as (timestamp, old limit, new limit, reason)
+    @type decisions: deque
+    @ivar listener: If given, will be called with each decision
+    @type listener: function((Float, Int, Int, String))
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=32):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = 0.5
+        self.latency_tolerance = 2.0
+        self.cooldown = 1.0
+        self.latency = None
+        self.decisions = collections.deque(maxlen=100)
+        self.listener = None
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._peak = 0
+        self._base_latency = None
+        self._last_decrease = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        """
+        @return: The number of requests currently allowed at the same time
+        @rtype: Int
+        """
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        """
+        @return: The number of requests currently running
+        @rtype: Int
+        """
+        return self._in_flight
+
+    def acquire(self):
+        """
+        Waits until a request can be made
+        @return: The start time, to give to release
+        @rtype: Float
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_flight)
+        return time.time()
+
+    def release(self, started, overloaded=False):
+        """
+        Must be called once the request made after acquire is over
+        @param started: The value returned by acquire
+        @type started: Float
+        @param overloaded: If the request timed out or got a 429 or 5xx answer
+        @type overloaded: Boolean
+        """
+        now = time.time()
+        with self._condition:
+            self._in_flight -= 1
+            if overloaded:
+                if now - self._last_decrease >= self.cooldown:
+                    self._last_decrease = now
+                    self._set_limit(max(self._limit * self.decrease_factor, self.min_limit), "overloaded", now)
+            else:
+                self._observe_latency(now - started)
+                # The limit is only raised if it was actually used, otherwise it would grow with sequential requests
+                saturated = self._peak >= int(self._limit)
+                if saturated and self.latency <= self._base_latency * self.latency_tolerance:
+                    self._set_limit(min(self._limit + 1.0 / int(self._limit), self.max_limit), "healthy", now)
+            if self._in_flight == 0:
+                self._peak = 0
+            self._condition.notify_all()
+
+    def snapshot(self):
+        """
+        @return: The current state of the limiter, for monitoring
+        @rtype: Dictionary
+        """
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "latency": self.latency,
+                "base_latency": self._base_latency,
+                "decisions": list(self.decisions),
+            }
+
+    def _observe_latency(self, latency):
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += (latency - self.latency) * 0.2
+        if self._base_latency is None or latency < self._base_latency:
+            self._base_latency = latency
+        else:
+            # Lets the reference follow a backend that became durably slower
+            self._base_latency += (latency - self._base_latency) * 0.01
+
+    def _set_limit(self, limit, reason, now):
+        old = int(self._limit)
+        self._limit = limit
+        if int(limit) != old:
+            self._peak = self._in_flight
+            decision = (now, old, int(limit), reason)
+            self.decisions.append(decision)
+            if self.listener is not None:
+                self.listener(decision)
@@ -0,0 +1,246 @@
+# -*- coding:Utf-8 -*
+"""
+@author: Thibault de Balthasar
+@contact: contact (at) thibaultdebalt [.] fr
+@license: GNU GENERAL PUBLIC LICENSE Version 3
+"""
+
+import threading
+import time
+
+
+class ConfirmationTracker(object):
+    """
+    Follows the confirmations of many transactions by only watching the tip of the chain. Once a transaction is in a \
+    block, its height is recorded and its confirmations are computed from the height of the tip. The new blocks are \
+    scanned to find the pending transactions, so a transaction is only loaded once, when it starts being tracked.
+
+    A reorganisation is detected when the previousBlockHash of the new blocks does not lead to the blocks we know. The \
+    transactions of the abandoned blocks go back to pending and will be found again in the new blocks.
+
+    The methods can be called from several threads, for example track from the application and poll from the block \
+    callback of an InsightSubscriber. The callbacks are called once the lock of the tracker is released, so they can \
+    use the tracker or other objects that are used from other threads.
+
+    @ivar api: The api to use
+    @type api: InsightApi
+    @ivar thresholds: The numbers of confirmations for which the callbacks are called
+    @type thresholds: [Int]
+    @ivar max_depth: The number of blocks kept to detect reorganisations, and the maximum number of blocks walked \
+    back from the tip. If the chain moved further, the tracked transactions are loaded again.
+    @type max_depth: Int
+    @ivar forget_settled: If the transactions are removed once the highest threshold is reached
+    @type forget_settled: Boolean
+    """
+
+    def __init__(self, api, thresholds=(1, 6), max_depth=100, forget_settled=True):
+        self.api = api
+        self.thresholds = sorted(thresholds)
+        self.max_depth = max_depth
+        self.forget_settled = forget_settled
+        self.tip_hash = None
+        self.tip_height = None
+        self._heights = {}
+        self._reached = {}
+        self._chain = {}
+        self._confirmation_callbacks = []
+        self._reorg_callbacks = []
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._heights)
+
+    def __contains__(self, txid):
+        return txid in self._heights
+
+    def on_confirmation(self, callback):
+        """
+        @param callback: Will be called with the txid, the threshold reached and the actual number of confirmations
+        @type callback: function(String, Int, Int)
+        """
+        self._confirmation_callbacks.append(callback)
+
+    def on_reorg(self, callback):
+        """
+        @param callback: Will be called with the txid and the height of its block when this block leaves the chain
+        @type callback: function(String, Int)
+        """
+        self._reorg_callbacks.append(callback)
+
+    def track(self, txid, height=None):
+        """
+        Starts tracking a transaction. If its height is not given, the transaction is loaded to know if it is already \
+        in a block.
+        @param txid: The hash of the transaction
+        @type txid: String
+        @param height: The height of the block containing the transaction, if already known
+        @type height: Int
+        """
+        with self._lock:
+            calls = []
+            if self.tip_hash is None:
+                # Without any known block, the first poll can not need a reload
+                calls += self._poll()[0]
+            if height is None:
+                height = self.api.get_transaction(txid).blockHeight
+            self._heights[txid] = height
+            self._reached[txid] = set()
+            calls += self._notify([txid])
+        _call_all(calls)
+
+    def untrack(self, txid):
+        """
+        @param txid: The hash of the transaction we do not want to follow anymore
+        @type txid: String
+        """
+        with self._lock:
+            self._heights.pop(txid, None)
+            self._reached.pop(txid, None)
+
+    def get_confirmations(self, txid):
+        """
+        @param txid: The hash of a tracked transaction
+        @type txid: String
+        @return: The number of confirmations of the transaction, 0 if it is not in a block
+        @rtype: Int
+        """
+        with self._lock:
+            height = self._heights[txid]
+            if height is None or self.tip_height is None:
+                return 0
+            return max(self.tip_height - height + 1, 0)
+
+    def poll(self):
+        """
+        Looks for a new tip, and updates the transactions accordingly. It only makes one request if the tip did not \
+        change, it can be called from a block callback of an InsightSubscriber.
+        """
+        with self._lock:
+            calls, reload_tip = self._poll()
+            tip_hash = self.tip_hash
+            txids = list(self._heights)
+        if reload_tip is not None:
+            transactions = self.api.get_transactions(txids)
+            heights = dict((transaction.txid, transaction.blockHeight) for transaction in transactions)
+            with self._lock:
+                calls += self._reload(reload_tip, tip_hash, heights)
+        _call_all(calls)
+
+    def run(self, interval=30):
+        """
+        Polls forever
+        @param interval: The time (seconds) to wait between two polls
+        @type interval: Int
+        """
+        while True:
+            self.poll()
+            time.sleep(interval)
+
+    def _poll(self):
+        """
+        Does the work of poll while the lock is held
+        @return: The callbacks to call once the lock is released, with their arguments, and the new tip if the chain \
+        moved too much and the transactions must be loaded again with _reload
+        """
+        tip_hash = self.api.get_last_block_hash()
+        if tip_hash == self.tip_hash:
+            return [], None
+        tip = self.api.get_block(tip_hash)
+        if not tip.isMainChain:
+            return [], None
+
+        calls = []
+        new_blocks = [tip]
+        if self._chain:
+            block = tip
+            while self._chain.get(block.height - 1) != block.previousBlockHash:
+                if len(new_blocks) >= self.max_depth:
+                    return [], tip
+                block = self.api.get_block(block.previousBlockHash)
+                new_blocks.append(block)
+            calls += self._forget_from(block.height)
+
+        for block in reversed(new_blocks):
+            self._chain[block.height] = block.hash
+            transactions = set(block.tx)
+            for txid, height in self._heights.items():
+                if height is None and txid in transactions:
+                    self._heights[txid] = block.height
+        self._set_tip(tip)
+        return calls + self._notify(list(self._heights)), None
+
+    def _set_tip(self, tip):
+        self.tip_hash = tip.hash
+        self.tip_height = tip.height
+        for height in [height for height in self._chain if height <= tip.height - self.max_depth]:
+            del self._chain[height]
+
+    def _forget_from(self, height):
+        """
+        Removes the blocks from the given height, they are replaced by the ones of the new chain
+        @return: The reorg callbacks to call, with their arguments
+        """
+        calls = []
+        for known_height in [known_height for known_height in self._chain if known_height >= height]:
+            del self._chain[known_height]
+        for txid, tx_height in list(self._heights.items()):
+            if tx_height is not None and tx_height >= height:
+                self._heights[txid] = None
+                self._reached[txid] = set()
+                for callback in self._reorg_callbacks:
+                    calls.append((callback, (txid, tx_height)))
+        return calls
+
+    def _reload(self, tip, previous_tip_hash, heights):
+        """
+        Used when the chain moved too much to be followed block by block, the transactions were loaded again without \
+        holding the lock.
+        @param previous_tip_hash: The tip when the transactions started being loaded, nothing is done if another poll \
+        changed it meanwhile
+        @param heights: The height of each transaction as loaded
+        @type heights: {String: Int}
+        @return: The callbacks to call, with their arguments
+        """
+        if self.tip_hash != previous_tip_hash:
+            return []
+        calls = []
+        self._chain = {tip.height: tip.hash}
+        self._set_tip(tip)
+        for txid, old_height in list(self._heights.items()):
+            if txid not in heights:
+                continue
+            height = heights[txid]
+            if old_height is not None and height != old_height:
+                self._reached[txid] = set()
+                for callback in self._reorg_callbacks:
+                    calls.append((callback, (txid, old_height)))
+            self._heights[txid] = height
+        return calls + self._notify(list(self._heights))
+
+    def _notify(self, txids):
+        """
+        Records the thresholds reached by the given transactions
+        @return: The confirmation callbacks to call, with their arguments
+        """
+        calls = []
+        for txid in txids:
+            if txid not in self._heights:
+                continue
+            confirmations = self.get_confirmations(txid)
+            reached = self._reached[txid]
+            for threshold in self.thresholds:
+                if threshold <= confirmations and threshold not in reached:
+                    reached.add(threshold)
+                    for callback in self._confirmation_callbacks:
+                        calls.append((callback, (txid, threshold, confirmations)))
+            if self.forget_settled and len(reached) == len(self.thresholds):
+                self.untrack(txid)
+        return calls
+
+
+def _call_all(calls):
+    """
+    Calls the callbacks collected while the lock was held
+    """
+    for callback, args in calls:
+        callback(*args)
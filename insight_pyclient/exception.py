@@ -56,3 +56,16 @@ class ParamException(InsightPyClientException):
     def __init__(self, message):
         super(InsightPyClientException, self).__init__(message)
         self.message = message
+
+
+class SubscriptionException(InsightPyClientException):
+    """
+    This exception will be raised if the connection to the socket.io interface of the API can not be made.
+
+    @ivar message: The message of the exception
+    @type message: String
+    """
+
+    def __init__(self, message):
+        super(InsightPyClientException, self).__init__(message)
+        self.message = message
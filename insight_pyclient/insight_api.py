@@ -10,12 +10,20 @@ import json
 import time
 import traceback
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
 from requests.auth import HTTPDigestAuth
 
 from .block import Block, BlockSummaryPagination
 from .transaction import Transaction
 from .exception import APIException, ParamException
 from .address import Address, UnspentOutput
+from .address_index import AddressIndex
+from .concurrency import AdaptiveConcurrencyLimiter
+from .parsing import parse_block, parse_transaction, parse_transactions_page
 from .utils import *
 
 
@@ -40,6 +48,13 @@ class InsightApi(object):
     @type userName: String
     @ivar password: The password that will be used if the digest or the basic authentication is enabled
     @type password: String
+    @ivar address_index: Every transaction loaded is added to this index, set it to None to disable the indexing
+    @type address_index: AddressIndex
+    @ivar parsing_pool: If given, the bulk methods will parse the responses in this pool of processes
+    @type parsing_pool: ParsingPool
+    @ivar concurrency: Limits the number of requests made at the same time, it adapts to the health of the API. It is \
+    shared by all the requests of this instance, set it to None to disable it and to make the bulk methods sequential
+    @type concurrency: AdaptiveConcurrencyLimiter
     """
 
     def __init__(self, address, try_hard=False):
@@ -53,6 +68,9 @@ class InsightApi(object):
         self.digestAuth = False
         self.userName = None
         self.password = None
+        self.address_index = AddressIndex()
+        self.parsing_pool = None
+        self.concurrency = AdaptiveConcurrencyLimiter()
 
     def make_request(self, url, wait_time=1, expected_http_return=200):
         """
@@ -66,12 +84,7 @@ class InsightApi(object):
         @return: The result given by the request module
         """
         try:
-            if self.digestAuth:
-                res = requests.get(self.address + url, timeout=self.timeout, auth=(self.userName, self.password))
-            elif self.basicAuth:
-                res = requests.get(self.address + url, timeout=self.timeout, auth=HTTPDigestAuth(self.userName, self.password))
-            else:
-                res = requests.get(self.address + url, timeout=self.timeout)
+            res = self._get(url)
             if res.status_code != expected_http_return:
                 raise APIException("Wrong status code", res.status_code, res.text, url)
             return res
@@ -87,6 +100,63 @@ class InsightApi(object):
                 wait_time = self.max_wait_time
             return self.make_request(url, wait_time, expected_http_return)
 
+    def _get(self, url):
+        """
+        Makes a single request, within the limit of the concurrency limiter
+        """
+        limiter = self.concurrency
+        if limiter is not None:
+            started = limiter.acquire()
+        overloaded = True
+        try:
+            if self.digestAuth:
+                res = requests.get(self.address + url, timeout=self.timeout, auth=(self.userName, self.password))
+            elif self.basicAuth:
+                res = requests.get(self.address + url, timeout=self.timeout, auth=HTTPDigestAuth(self.userName, self.password))
+            else:
+                res = requests.get(self.address + url, timeout=self.timeout)
+            overloaded = res.status_code == 429 or res.status_code >= 500
+            return res
+        finally:
+            if limiter is not None:
+                limiter.release(started, overloaded)
+
+    def map_parallel(self, function, items):
+        """
+        Calls the function on each item from several threads, the number of requests made at the same time is then \
+        decided by the concurrency limiter. Without limiter, the calls are made one after the other.
+        @param function: The function to call, it will usually make a request
+        @param items: The arguments to give to the function
+        @return: The results, in the same order as the items
+        """
+        items = list(items)
+        if self.concurrency is None or ThreadPoolExecutor is None or len(items) < 2:
+            return [function(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(len(items), self.concurrency.max_limit)) as executor:
+            return list(executor.map(function, items))
+
+    def fetch_and_parse(self, urls, parser):
+        """
+        Requests the urls in parallel and parses the responses with the parsing pool if there is one.
+        @param urls: The urls to request
+        @type urls: [String]
+        @param parser: The function of the parsing module to use on each response
+        @return: The parsed responses, in the same order as the urls
+        """
+        if self.parsing_pool is None:
+            return self.map_parallel(lambda url: parser(self.make_request(url).content), urls)
+        futures = self.map_parallel(lambda url: self.parsing_pool.submit(parser, self.make_request(url).content), urls)
+        return [future.result() for future in futures]
+
+    def index_transactions(self, transactions):
+        """
+        Adds the given transactions to the address index if it is enabled
+        @param transactions: The transactions loaded from the API
+        @type transactions: [Transaction]
+        """
+        if self.address_index is not None:
+            self.address_index.add_transactions(transactions)
+
     def get_block(self, block_hash):
         """
         @param block_hash: The hash of the block to get
@@ -98,6 +168,16 @@ class InsightApi(object):
         block = Block(res.text)
         return block
 
+    def get_blocks(self, block_hashes):
+        """
+        Loads many blocks, their parsing is done in the parsing pool while the next ones are requested.
+        @param block_hashes: The hashes of the blocks to get
+        @type block_hashes: [String]
+        @return: The blocks from the API, in the same order
+        @rtype: [Block]
+        """
+        return self.fetch_and_parse(['block/' + block_hash for block_hash in block_hashes], parse_block)
+
     def get_block_hash(self, height):
         """
         @param height: The height of the block to get
@@ -109,6 +189,15 @@ class InsightApi(object):
         parsed = json.loads(res.text)
         return parsed["blockHash"]
 
+    def get_last_block_hash(self):
+        """
+        @return: The hash of the last block of the chain known by the API
+        @rtype: String
+        """
+        res = self.make_request('status?q=getLastBlockHash')
+        parsed = json.loads(res.text)
+        return parsed["lastblockhash"]
+
     def get_raw_block(self, block_hash):
         """
         @param block_hash: The hash of the block to get
@@ -148,8 +237,21 @@ class InsightApi(object):
         """
         res = self.make_request('tx/' + transaction_hash)
         tx = Transaction(res.text)
+        self.index_transactions([tx])
         return tx
 
+    def get_transactions(self, transaction_hashes):
+        """
+        Loads many transactions, their parsing is done in the parsing pool while the next ones are requested.
+        @param transaction_hashes: The hashes of the transactions to get
+        @type transaction_hashes: [String]
+        @return: The transactions from the API, in the same order
+        @rtype: [Transaction]
+        """
+        transactions = self.fetch_and_parse(['tx/' + tx_hash for tx_hash in transaction_hashes], parse_transaction)
+        self.index_transactions(transactions)
+        return transactions
+
     def get_raw_transaction(self, transaction_hash):
         """
         @param transaction_hash: The hash of the transaction to get
@@ -287,23 +389,29 @@ class InsightApi(object):
         if transactions_to is not None:
             request_string += 'to=' + str(transactions_to)
         res = self.make_request(request_string)
-        parsed = json.loads(res.text)
-        transactions_list = []
-        for transaction in parsed["items"]:
-            transactions_list.append(Transaction(transaction, True))
-        return transactions_list, parsed["totalItems"], parsed["from"], parsed["to"]
+        if self.parsing_pool is None:
+            result = parse_transactions_page(res.content)
+        else:
+            result = self.parsing_pool.parse(parse_transactions_page, res.content)
+        self.index_transactions(result[0])
+        return result
 
     def get_all_transactions_for_address(self, address, tx_from=0, tx_to=50):
         """
-        Allows to get all the transactions for an address using the get_transaction_for_address method.
+        Allows to get all the transactions for an address using the get_transaction_for_address method. Once the \
+        first page is loaded, the next ones are loaded in parallel.
         @param address: The address to get the transactions from
         @type address: String
-        @param tx_from: Used in the recursion
-        @param tx_to: Used in the recursion
+        @param tx_from: The first transaction to get, 0 by default
+        @param tx_to: The end of the first page, 50 by default
         @return: The transactions for the address
         @rtype: [Transaction]
         """
         transactions, total, tx_from, tx_to = self.get_transaction_for_addresses([address], tx_from, tx_to)
         if tx_to >= total:
             return transactions
-        return transactions + self.get_all_transactions_for_address(address, tx_from + 50, tx_to + 50)
+        pages = self.map_parallel(lambda start: self.get_transaction_for_addresses([address], start, start + 50)[0],
+                                  range(tx_from + 50, total, 50))
+        for page in pages:
+            transactions += page
+        return transactions
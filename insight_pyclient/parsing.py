@@ -0,0 +1,170 @@
+# -*- coding:Utf-8 -*
+"""
+Allows to parse the responses of the API in other processes, so that decoding large batches does not keep a single \
+core busy while the network is idle.
+
+@author: Thibault de Balthasar
+@contact: contact (at) thibaultdebalt [.] fr
+@license: GNU GENERAL PUBLIC LICENSE Version 3
+"""
+
+import json
+
+try:
+    from concurrent.futures import Future, ProcessPoolExecutor
+except ImportError:
+    Future = None
+    ProcessPoolExecutor = None
+
+from .block import Block
+from .transaction import Transaction
+
+
+def parse_block(raw):
+    """
+    @param raw: The body returned by the block/ endpoint
+    @type raw: bytes
+    @rtype: Block
+    """
+    return Block(raw)
+
+
+def parse_transaction(raw):
+    """
+    @param raw: The body returned by the tx/ endpoint
+    @type raw: bytes
+    @rtype: Transaction
+    """
+    return Transaction(raw)
+
+
+def parse_transactions_page(raw):
+    """
+    @param raw: The body returned by the addrs/[addresses]/txs endpoint
+    @type raw: bytes
+    @return: The transactions, the numbers of transactions, transactions from and to
+    @rtype: [Transaction], int, int, int
+    """
+    parsed = json.loads(raw)
+    transactions_list = []
+    for transaction in parsed["items"]:
+        transactions_list.append(Transaction(transaction, True))
+    return transactions_list, parsed["totalItems"], parsed["from"], parsed["to"]
+
+
+def _restore(cls, state):
+    """
+    Builds a model from the state given by its __getstate__ method
+    """
+    obj = cls.__new__(cls)
+    obj.__setstate__(state)
+    return obj
+
+
+def _block_state(raw):
+    return parse_block(raw).__getstate__()
+
+
+def _transaction_state(raw):
+    return parse_transaction(raw).__getstate__()
+
+
+def _transactions_page_state(raw):
+    transactions, total, tx_from, tx_to = parse_transactions_page(raw)
+    return [transaction.__getstate__() for transaction in transactions], total, tx_from, tx_to
+
+
+def _block_from_state(state):
+    return _restore(Block, state)
+
+
+def _transaction_from_state(state):
+    return _restore(Transaction, state)
+
+
+def _transactions_page_from_state(state):
+    states, total, tx_from, tx_to = state
+    return [_restore(Transaction, transaction) for transaction in states], total, tx_from, tx_to
+
+
+# For each parser, the function run by the workers and the one building the result from what they return. The workers
+# only send plain values so that the calling process has as little as possible left to do.
+_WORKER_PARSERS = {
+    parse_block: (_block_state, _block_from_state),
+    parse_transaction: (_transaction_state, _transaction_from_state),
+    parse_transactions_page: (_transactions_page_state, _transactions_page_from_state),
+}
+
+
+class ParsingPool(object):
+    """
+    A pool of processes the responses are given to in order to be parsed. The responses smaller than the threshold are \
+    parsed in the calling process as sending them to another process would cost more than parsing them. The workers \
+    send back tuples of plain values, from which the objects are built in the calling process.
+
+    @ivar threshold: The size (bytes) from which a response is parsed in the pool
+    @type threshold: Int
+    @ivar workers: The number of processes, the number of cores by default
+    @type workers: Int
+    """
+
+    def __init__(self, workers=None, threshold=32768):
+        if ProcessPoolExecutor is None:
+            raise ImportError("The parsing pool needs concurrent.futures, install the futures package")
+        self.threshold = threshold
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, trace):
+        self.shutdown()
+
+    def submit(self, parser, raw):
+        """
+        @param parser: The function to use, for example parse_transaction. The parsers of this module send plain \
+        values back from the workers, any other function must be picklable and its result is returned as it is
+        @param raw: The body of the response
+        @type raw: bytes
+        @return: Will give the parsed object
+        @rtype: concurrent.futures.Future
+        """
+        if len(raw) < self.threshold:
+            future = Future()
+            try:
+                future.set_result(parser(raw))
+            except Exception as ex:
+                future.set_exception(ex)
+            return future
+        if parser not in _WORKER_PARSERS:
+            return self._executor.submit(parser, raw)
+        worker_parser, build = _WORKER_PARSERS[parser]
+        future = Future()
+        self._executor.submit(worker_parser, raw).add_done_callback(lambda done: _build_result(done, build, future))
+        return future
+
+    def parse(self, parser, raw):
+        """
+        @param parser: The function of this module to use, for example parse_transaction
+        @param raw: The body of the response
+        @type raw: bytes
+        @return: The parsed object
+        """
+        return self.submit(parser, raw).result()
+
+    def shutdown(self):
+        """
+        Stops the processes of the pool
+        """
+        self._executor.shutdown()
+
+
+def _build_result(done, build, future):
+    """
+    Gives to the future the object built from the result of a worker
+    """
+    try:
+        future.set_result(build(done.result()))
+    except Exception as ex:
+        future.set_exception(ex)
@@ -0,0 +1,237 @@
+# -*- coding:Utf-8 -*
+"""
+Will contain the binary encoding used by the to_bytes and from_bytes methods of the models. It is the msgpack format, \
+the msgpack package is used if it is installed, otherwise the subset of the format needed by the models is encoded \
+here.
+
+@author: Thibault de Balthasar
+@contact: contact (at) thibaultdebalt [.] fr
+@license: GNU GENERAL PUBLIC LICENSE Version 3
+"""
+
+import binascii
+import datetime
+import struct
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from .exception import ParamException
+
+# What can be raised while building a model from fields of the wrong types
+DECODING_ERRORS = (TypeError, ValueError, IndexError, AttributeError, OverflowError)
+
+try:
+    _integer_types = (int, long)
+    _text_type = unicode
+except NameError:
+    _integer_types = (int,)
+    _text_type = str
+
+
+def packb(obj):
+    """
+    @param obj: The value to encode, made of None, booleans, integers, floats, bytes, strings, lists and tuples
+    @return: The encoded value
+    @rtype: bytes
+    """
+    if msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    chunks = []
+    _pack(obj, chunks)
+    return b"".join(chunks)
+
+
+def unpackb(data):
+    """
+    @param data: A value encoded by packb
+    @type data: bytes
+    @return: The decoded value, the tuples are decoded as lists
+    """
+    if msgpack is not None:
+        try:
+            return msgpack.unpackb(data, raw=False)
+        except Exception as ex:
+            raise ParamException("Unable to decode the given data, " + type(ex).__name__ + ": " + str(ex))
+    try:
+        obj, offset = _unpack(data, 0)
+    except (struct.error, IndexError):
+        raise ParamException("The given data is truncated")
+    except ValueError as ex:
+        raise ParamException("Unable to decode the given data, " + type(ex).__name__ + ": " + str(ex))
+    if offset != len(data):
+        raise ParamException("The given data contains more than one value")
+    return obj
+
+
+def unpack_fields(data, length, name):
+    """
+    Decodes the list of fields of a model encoded with packb
+    @param data: The encoded fields
+    @type data: bytes
+    @param length: The number of fields expected
+    @type length: Int
+    @param name: What the data should be, for the error message
+    @type name: String
+    @return: The fields
+    @rtype: list
+    """
+    fields = unpackb(data)
+    if not isinstance(fields, list) or len(fields) != length:
+        raise ParamException("The given data is not an encoded " + name)
+    return fields
+
+
+def hex_to_bytes(value):
+    """
+    @param value: An hexadecimal string, like the hashes returned by the API
+    @type value: String (Nullable)
+    @rtype: bytes (Nullable)
+    """
+    if value is None:
+        return None
+    return binascii.unhexlify(value)
+
+
+def bytes_to_hex(value):
+    """
+    @param value: The result of hex_to_bytes
+    @type value: bytes (Nullable)
+    @rtype: String (Nullable)
+    """
+    if value is None:
+        return None
+    return binascii.hexlify(value).decode("ascii")
+
+
+def timestamp_to_datetime(value):
+    """
+    @param value: A time in seconds since the epoch, like the ones returned by the API
+    @type value: Int (Nullable)
+    @rtype: datetime (Nullable)
+    """
+    if value is None:
+        return None
+    return datetime.datetime.fromtimestamp(value)
+
+
+def _pack(obj, chunks):
+    if obj is None:
+        chunks.append(b"\xc0")
+    elif obj is True:
+        chunks.append(b"\xc3")
+    elif obj is False:
+        chunks.append(b"\xc2")
+    elif isinstance(obj, _integer_types):
+        if 0 <= obj < 0x80:
+            chunks.append(struct.pack(">B", obj))
+        elif -0x20 <= obj < 0:
+            chunks.append(struct.pack(">b", obj))
+        elif 0 <= obj <= 0xff:
+            chunks.append(struct.pack(">BB", 0xcc, obj))
+        elif 0 <= obj <= 0xffff:
+            chunks.append(struct.pack(">BH", 0xcd, obj))
+        elif 0 <= obj <= 0xffffffff:
+            chunks.append(struct.pack(">BI", 0xce, obj))
+        elif 0 <= obj:
+            chunks.append(struct.pack(">BQ", 0xcf, obj))
+        elif -0x80 <= obj:
+            chunks.append(struct.pack(">Bb", 0xd0, obj))
+        elif -0x8000 <= obj:
+            chunks.append(struct.pack(">Bh", 0xd1, obj))
+        elif -0x80000000 <= obj:
+            chunks.append(struct.pack(">Bi", 0xd2, obj))
+        else:
+            chunks.append(struct.pack(">Bq", 0xd3, obj))
+    elif isinstance(obj, float):
+        chunks.append(struct.pack(">Bd", 0xcb, obj))
+    elif isinstance(obj, (bytes, bytearray)):
+        length = len(obj)
+        if length <= 0xff:
+            chunks.append(struct.pack(">BB", 0xc4, length))
+        elif length <= 0xffff:
+            chunks.append(struct.pack(">BH", 0xc5, length))
+        else:
+            chunks.append(struct.pack(">BI", 0xc6, length))
+        chunks.append(bytes(obj))
+    elif isinstance(obj, _text_type):
+        encoded = obj.encode("utf-8")
+        length = len(encoded)
+        if length < 0x20:
+            chunks.append(struct.pack(">B", 0xa0 | length))
+        elif length <= 0xff:
+            chunks.append(struct.pack(">BB", 0xd9, length))
+        elif length <= 0xffff:
+            chunks.append(struct.pack(">BH", 0xda, length))
+        else:
+            chunks.append(struct.pack(">BI", 0xdb, length))
+        chunks.append(encoded)
+    elif isinstance(obj, (list, tuple)):
+        length = len(obj)
+        if length < 0x10:
+            chunks.append(struct.pack(">B", 0x90 | length))
+        elif length <= 0xffff:
+            chunks.append(struct.pack(">BH", 0xdc, length))
+        else:
+            chunks.append(struct.pack(">BI", 0xdd, length))
+        for item in obj:
+            _pack(item, chunks)
+    else:
+        raise ParamException("Unable to encode a value of type " + type(obj).__name__)
+
+
+_FIXED_FORMATS = {
+    0xcc: ">B", 0xcd: ">H", 0xce: ">I", 0xcf: ">Q",
+    0xd0: ">b", 0xd1: ">h", 0xd2: ">i", 0xd3: ">q",
+    0xca: ">f", 0xcb: ">d",
+}
+_LENGTH_FORMATS = {
+    0xc4: ">B", 0xc5: ">H", 0xc6: ">I",
+    0xd9: ">B", 0xda: ">H", 0xdb: ">I",
+    0xdc: ">H", 0xdd: ">I",
+}
+
+
+def _unpack(data, offset):
+    code = struct.unpack_from(">B", data, offset)[0]
+    offset += 1
+    if code < 0x80:
+        return code, offset
+    if code >= 0xe0:
+        return code - 0x100, offset
+    if code == 0xc0:
+        return None, offset
+    if code == 0xc2:
+        return False, offset
+    if code == 0xc3:
+        return True, offset
+    if code in _FIXED_FORMATS:
+        fmt = _FIXED_FORMATS[code]
+        return struct.unpack_from(fmt, data, offset)[0], offset + struct.calcsize(fmt)
+
+    if 0xa0 <= code < 0xc0 or 0x90 <= code < 0xa0:
+        length = code & (0x1f if code >= 0xa0 else 0x0f)
+        is_array = code < 0xa0
+    elif code in _LENGTH_FORMATS:
+        fmt = _LENGTH_FORMATS[code]
+        length = struct.unpack_from(fmt, data, offset)[0]
+        offset += struct.calcsize(fmt)
+        is_array = code in (0xdc, 0xdd)
+    else:
+        raise ParamException("Unable to decode the type " + hex(code))
+
+    if is_array:
+        items = []
+        for _ in range(length):
+            item, offset = _unpack(data, offset)
+            items.append(item)
+        return items, offset
+    end = offset + length
+    if end > len(data):
+        raise ParamException("The given data is truncated")
+    value = bytes(data[offset:end])
+    if code in (0xc4, 0xc5, 0xc6):
+        return value, end
+    return value.decode("utf-8"), end
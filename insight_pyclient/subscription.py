@@ -0,0 +1,295 @@
+# -*- coding:Utf-8 -*
+"""
+Allows to be notified of the new blocks, transactions and address activity through the socket.io interface of the \
+API instead of polling it.
+
+@author: Thibault de Balthasar
+@contact: contact (at) thibaultdebalt [.] fr
+@license: GNU GENERAL PUBLIC LICENSE Version 3
+"""
+
+import collections
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+try:
+    import socketio
+except ImportError:
+    socketio = None
+
+from .exception import SubscriptionException
+
+ADDRESS_EVENT = 'bitcoind/addresstxid'
+
+
+class InsightSubscriber(object):
+    """
+    Subscribes to the "inv" room of the API, which publishes the new blocks and transactions, and to the \
+    "bitcoind/addresstxid" events of the watched addresses, as done by the Insight API of bitcore-node. The socket.io \
+    client reconnects by itself and, after a reconnection, the blocks mined while we were disconnected are loaded with \
+    get_block_hash and given to the block callbacks. If loading them fails, it is tried again on the next block or \
+    connection, the blocks received meanwhile are still given to the callbacks. The callbacks are called without \
+    holding any lock, so they can use the subscriber or other objects that are used from other threads.
+
+    @ivar api: The api used to load the missed blocks, its address is used to find the socket.io interface
+    @type api: InsightApi
+    @ivar url: The url of the socket.io interface, by default the root of the api address
+    @type url: String
+    @ivar backfill: If the missed blocks must be loaded after a reconnection
+    @type backfill: Boolean
+    """
+
+    def __init__(self, api, url=None, client=None):
+        """
+        :param api: The InsightApi instance to use
+        :param url: The url of the socket.io interface if it is not at the root of the api address
+        :param client: A socket.io client to use instead of a python-socketio one, it must provide on, connect, emit, \
+        wait and disconnect like python-socketio does, a tuple given to emit being sent as several arguments
+        """
+        self.api = api
+        if url is None:
+            parsed_url = urlparse(api.address)
+            url = parsed_url.scheme + '://' + parsed_url.netloc
+        self.url = url
+        self.backfill = True
+        self._client = client
+        self._block_callbacks = []
+        self._transaction_callbacks = []
+        self._address_callbacks = {}
+        self._last_block_hash = None
+        self._missed_blocks = False
+        self._backfilling = False
+        self._recent_blocks = collections.deque(maxlen=16)
+        self._queues = []
+        self._connected = False
+        self._lock = threading.RLock()
+
+    def on_block(self, callback):
+        """
+        @param callback: Will be called with the hash of each new block
+        @type callback: function(String)
+        """
+        self._block_callbacks.append(callback)
+
+    def on_transaction(self, callback):
+        """
+        @param callback: Will be called with each new transaction as sent by the API, a dictionary containing txid, \
+        valueOut and vout
+        @type callback: function(Dictionary)
+        """
+        self._transaction_callbacks.append(callback)
+
+    def watch_address(self, address, callback=None):
+        """
+        @param address: The address to be notified about
+        @type address: String
+        @param callback: Will be called with the address and the hash of each transaction involving it
+        @type callback: function(String, String)
+        """
+        with self._lock:
+            is_new = address not in self._address_callbacks
+            callbacks = self._address_callbacks.setdefault(address, [])
+            if callback is not None:
+                callbacks.append(callback)
+        if is_new and self._connected:
+            self._client.emit('subscribe', (ADDRESS_EVENT, [address]))
+
+    def unwatch_address(self, address):
+        """
+        @param address: The address we do not want to be notified about anymore
+        @type address: String
+        """
+        with self._lock:
+            self._address_callbacks.pop(address, None)
+        if self._connected:
+            self._client.emit('unsubscribe', (ADDRESS_EVENT, [address]))
+
+    def connect(self):
+        """
+        Connects to the socket.io interface and subscribes to the rooms. It returns once connected, the events are \
+        handled in the background.
+        """
+        if self._client is None:
+            if socketio is None:
+                raise SubscriptionException("The subscriptions need the python-socketio package")
+            self._client = socketio.Client(reconnection=True)
+        self._client.on('connect', self._on_connect)
+        self._client.on('disconnect', self._on_disconnect)
+        self._client.on('block', self._on_block)
+        self._client.on('tx', self._on_transaction)
+        self._client.on(ADDRESS_EVENT, self._on_address_transaction)
+        try:
+            self._client.connect(self.url)
+        except Exception as ex:
+            raise SubscriptionException("Unable to connect to " + self.url + ": " + str(ex))
+
+    def wait(self):
+        """
+        Blocks until the connection is closed
+        """
+        self._client.wait()
+
+    def disconnect(self):
+        """
+        Closes the connection, the client will not reconnect
+        """
+        self._client.disconnect()
+
+    def events(self):
+        """
+        Allows to iterate over the events instead of using the callbacks. The events are kept from the call of this \
+        method, each iterator receives all of them. Close the iterator once done with it, the events stop being kept \
+        for it.
+        @return: Gives tuples ('block', hash), ('tx', transaction) and ('address', (address, txid)), the iteration \
+        blocks until an event arrives
+        @rtype: EventIterator
+        """
+        return EventIterator(self)
+
+    def _add_queue(self, events_queue):
+        with self._lock:
+            self._queues.append(events_queue)
+
+    def _remove_queue(self, events_queue):
+        with self._lock:
+            if events_queue in self._queues:
+                self._queues.remove(events_queue)
+
+    def _publish(self, kind, payload):
+        with self._lock:
+            queues = list(self._queues)
+        for events_queue in queues:
+            events_queue.put((kind, payload))
+
+    def _on_disconnect(self):
+        self._connected = False
+
+    def _on_connect(self):
+        self._connected = True
+        self._client.emit('subscribe', 'inv')
+        with self._lock:
+            addresses = list(self._address_callbacks)
+            last_block_hash = self._last_block_hash
+        if addresses:
+            self._client.emit('subscribe', (ADDRESS_EVENT, addresses))
+        if last_block_hash is None:
+            try:
+                tip_hash = self.api.get_last_block_hash()
+            except Exception:
+                return
+            with self._lock:
+                if self._last_block_hash is None:
+                    self._last_block_hash = tip_hash
+        elif self.backfill:
+            with self._lock:
+                self._missed_blocks = True
+            self._backfill()
+
+    def _backfill(self):
+        """
+        Gives to the callbacks the blocks following _last_block_hash, the last block given without any gap before it. \
+        If a request fails, the missing blocks are kept for the next try.
+        """
+        with self._lock:
+            if self._backfilling:
+                return
+            self._backfilling = True
+            last_block_hash = self._last_block_hash
+        try:
+            last_height = self.api.get_block(last_block_hash).height
+            tip_height = self.api.get_block(self.api.get_last_block_hash()).height
+            for height in range(last_height + 1, tip_height + 1):
+                self._deliver_block(self.api.get_block_hash(height), True)
+            with self._lock:
+                self._missed_blocks = False
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._backfilling = False
+
+    def _on_block(self, block_hash):
+        with self._lock:
+            missed_blocks = self._missed_blocks
+        if missed_blocks:
+            self._backfill()
+        with self._lock:
+            missed_blocks = self._missed_blocks
+        self._deliver_block(block_hash, not missed_blocks)
+
+    def _deliver_block(self, block_hash, contiguous):
+        """
+        @param contiguous: If all the blocks before this one were given, it then becomes the start of the next backfill
+        """
+        with self._lock:
+            if contiguous:
+                self._last_block_hash = block_hash
+            if block_hash in self._recent_blocks:
+                return
+            self._recent_blocks.append(block_hash)
+            callbacks = list(self._block_callbacks)
+        for callback in callbacks:
+            callback(block_hash)
+        self._publish('block', block_hash)
+
+    def _on_transaction(self, transaction):
+        for callback in self._transaction_callbacks:
+            callback(transaction)
+        self._publish('tx', transaction)
+
+    def _on_address_transaction(self, data):
+        address = data["address"]
+        with self._lock:
+            callbacks = list(self._address_callbacks.get(address, []))
+        for callback in callbacks:
+            callback(address, data["txid"])
+        self._publish('address', (address, data["txid"]))
+
+
+class EventIterator(object):
+    """
+    Gives the events received by an InsightSubscriber since its creation, see InsightSubscriber.events. The events \
+    are kept in a queue of its own until they are read, it stops receiving them once closed.
+    """
+
+    def __init__(self, subscriber):
+        self._subscriber = subscriber
+        self._queue = queue.Queue()
+        self._closed = False
+        subscriber._add_queue(self._queue)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._closed:
+            raise StopIteration
+        return self._queue.get()
+
+    next = __next__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, trace):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """
+        Stops receiving the events, the ones not read yet are dropped
+        """
+        if not self._closed:
+            self._closed = True
+            self._subscriber._remove_queue(self._queue)
@@ -8,6 +8,10 @@
 import json
 import datetime
 
+from .serialization import packb, unpack_fields, DECODING_ERRORS, hex_to_bytes, bytes_to_hex, timestamp_to_datetime
+from .exception import ParamException
+from .utils import satoshi_to_bitcoin, bitcoin_to_satoshi
+
 
 class TransactionInput(object):
     """
@@ -24,6 +28,9 @@ class TransactionInput(object):
     @type doubleSpentTxID: nullable (string ?)
     """
 
+    __slots__ = ("txid", "vout", "scriptSigAsm", "scriptSigHex", "sequence", "n", "addr", "valueSat", "value",
+                 "doubleSpentTxID")
+
     def __init__(self, parsed_json):
         self.txid = parsed_json["txid"]
         self.vout = parsed_json["vout"]
@@ -36,6 +43,38 @@ class TransactionInput(object):
         self.scriptSigAsm = parsed_json["scriptSig"]["asm"]
         self.scriptSigHex = parsed_json["scriptSig"].get("hex")
 
+    def __getstate__(self):
+        return (self.txid, self.vout, self.scriptSigAsm, self.scriptSigHex, self.sequence, self.n, self.addr,
+                self.valueSat, self.value, self.doubleSpentTxID)
+
+    def __setstate__(self, state):
+        (self.txid, self.vout, self.scriptSigAsm, self.scriptSigHex, self.sequence, self.n, self.addr, self.valueSat,
+         self.value, self.doubleSpentTxID) = state
+
+    def to_list(self):
+        """
+        @return: The fields of the input, with the hashes as raw bytes
+        @rtype: list
+        """
+        return [hex_to_bytes(self.txid), self.vout, self.sequence, self.n, self.addr, self.valueSat,
+                hex_to_bytes(self.doubleSpentTxID), self.scriptSigAsm, hex_to_bytes(self.scriptSigHex)]
+
+    @classmethod
+    def from_list(cls, fields):
+        """
+        @param fields: The result of to_list
+        @type fields: list
+        @rtype: TransactionInput
+        """
+        inp = cls.__new__(cls)
+        inp.txid = bytes_to_hex(fields[0])
+        inp.vout, inp.sequence, inp.n, inp.addr, inp.valueSat = fields[1:6]
+        inp.value = satoshi_to_bitcoin(inp.valueSat)
+        inp.doubleSpentTxID = bytes_to_hex(fields[6])
+        inp.scriptSigAsm = fields[7]
+        inp.scriptSigHex = bytes_to_hex(fields[8])
+        return inp
+
 
 class TransactionOutput(object):
     """
@@ -49,6 +88,8 @@ class TransactionOutput(object):
     @type scriptPubKey: TransactionOutput.ScriptPublicKey
     """
 
+    __slots__ = ("value", "n", "spentTxId", "spentIndex", "spentHeight", "scriptPubKey")
+
     def __init__(self, parsed_json):
         self.value = float(parsed_json["value"])
         self.n = parsed_json["n"]
@@ -57,6 +98,37 @@ class TransactionOutput(object):
         self.spentHeight = parsed_json.get("spentHeight")
         self.scriptPubKey = TransactionOutput.ScriptPublicKey(parsed_json["scriptPubKey"])
 
+    def __getstate__(self):
+        return self.value, self.n, self.spentTxId, self.spentIndex, self.spentHeight, self.scriptPubKey.__getstate__()
+
+    def __setstate__(self, state):
+        self.value, self.n, self.spentTxId, self.spentIndex, self.spentHeight, script_state = state
+        self.scriptPubKey = TransactionOutput.ScriptPublicKey.__new__(TransactionOutput.ScriptPublicKey)
+        self.scriptPubKey.__setstate__(script_state)
+
+    def to_list(self):
+        """
+        @return: The fields of the output, with the hashes as raw bytes and the value in satoshis
+        @rtype: list
+        """
+        return [bitcoin_to_satoshi(self.value), self.n, hex_to_bytes(self.spentTxId), self.spentIndex,
+                self.spentHeight, self.scriptPubKey.to_list()]
+
+    @classmethod
+    def from_list(cls, fields):
+        """
+        @param fields: The result of to_list
+        @type fields: list
+        @rtype: TransactionOutput
+        """
+        out = cls.__new__(cls)
+        out.value = satoshi_to_bitcoin(fields[0])
+        out.n = fields[1]
+        out.spentTxId = bytes_to_hex(fields[2])
+        out.spentIndex, out.spentHeight = fields[3:5]
+        out.scriptPubKey = TransactionOutput.ScriptPublicKey.from_list(fields[5])
+        return out
+
     class ScriptPublicKey(object):
         """
         To store the scriptPubKey
@@ -66,12 +138,39 @@ class TransactionOutput(object):
         @type type: String
         """
 
+        __slots__ = ("hex", "asm", "addresses", "type")
+
         def __init__(self, parsed_json):
             self.hex = parsed_json.get("hex")
             self.asm = parsed_json["asm"]
             self.addresses = parsed_json["addresses"]
             self.type = parsed_json["type"]
 
+        def __getstate__(self):
+            return self.hex, self.asm, self.addresses, self.type
+
+        def __setstate__(self, state):
+            self.hex, self.asm, self.addresses, self.type = state
+
+        def to_list(self):
+            """
+            @return: The fields of the script, with the script as raw bytes
+            @rtype: list
+            """
+            return [hex_to_bytes(self.hex), self.asm, self.addresses, self.type]
+
+        @classmethod
+        def from_list(cls, fields):
+            """
+            @param fields: The result of to_list
+            @type fields: list
+            @rtype: TransactionOutput.ScriptPublicKey
+            """
+            script = cls.__new__(cls)
+            script.hex = bytes_to_hex(fields[0])
+            script.asm, script.addresses, script.type = fields[1:4]
+            return script
+
 
 class Transaction(object):
     """
@@ -80,9 +179,11 @@ class Transaction(object):
     @type txid: String
     @type version: int
     @type lockTime: int
-    @type blockHeight: int
+    @type blockHash: String (Nullable, None while unconfirmed)
+    @type blockHeight: int (Nullable, None while unconfirmed)
     @type confirmations: int
     @type time: datetime
+    @type timestamp: int (The time as given by the API, in seconds since the epoch)
     @type valueOut: Float
     @type size: int
     @type valueIn: Float
@@ -91,6 +192,9 @@ class Transaction(object):
     @type outputs: [Output]
     """
 
+    __slots__ = ("txid", "version", "lockTime", "blockHash", "blockHeight", "confirmations", "time", "timestamp", "valueOut",
+                 "size", "valueIn", "fees", "inputs", "outputs")
+
     def __init__(self, string_json, already_parsed=False):
         """
         :param string_json: The string to parse
@@ -104,9 +208,13 @@ class Transaction(object):
         self.txid = parsed["txid"]
         self.version = parsed["version"]
         self.lockTime = parsed["locktime"]
-        #self.blockHeight = parsed["blockheight"]
+        self.blockHash = parsed.get("blockhash")
+        self.blockHeight = parsed.get("blockheight")
+        if self.blockHeight is not None and self.blockHeight < 0:
+            self.blockHeight = None
         self.confirmations = parsed["confirmations"]
-        self.time = datetime.datetime.fromtimestamp(parsed['time'])
+        self.timestamp = parsed['time']
+        self.time = datetime.datetime.fromtimestamp(self.timestamp)
         self.valueOut = parsed["valueOut"]
         self.size = parsed["size"]
         self.valueIn = parsed["valueIn"]
@@ -119,6 +227,68 @@ class Transaction(object):
         for item in parsed["vin"]:
             self.inputs.append(TransactionInput(item))
 
+    def __getstate__(self):
+        """
+        The state used by pickle is made of plain values only, the time is rebuilt from the timestamp
+        """
+        return (self.txid, self.version, self.lockTime, self.blockHash, self.blockHeight, self.confirmations,
+                self.timestamp, self.valueOut, self.size, self.valueIn, self.fees,
+                [inp.__getstate__() for inp in self.inputs], [out.__getstate__() for out in self.outputs])
+
+    def __setstate__(self, state):
+        (self.txid, self.version, self.lockTime, self.blockHash, self.blockHeight, self.confirmations, self.timestamp,
+         self.valueOut, self.size, self.valueIn, self.fees, inputs, outputs) = state
+        self.time = timestamp_to_datetime(self.timestamp)
+        self.inputs = []
+        for input_state in inputs:
+            inp = TransactionInput.__new__(TransactionInput)
+            inp.__setstate__(input_state)
+            self.inputs.append(inp)
+        self.outputs = []
+        for output_state in outputs:
+            out = TransactionOutput.__new__(TransactionOutput)
+            out.__setstate__(output_state)
+            self.outputs.append(out)
+
+    def to_bytes(self):
+        """
+        Encodes the transaction, the hashes are stored as raw bytes and the amounts as satoshis
+        @return: The encoded transaction
+        @rtype: bytes
+        """
+        return packb([hex_to_bytes(self.txid), self.version, self.lockTime, hex_to_bytes(self.blockHash),
+                      self.blockHeight, self.confirmations, self.timestamp,
+                      bitcoin_to_satoshi(self.valueOut), self.size, bitcoin_to_satoshi(self.valueIn),
+                      bitcoin_to_satoshi(self.fees), [inp.to_list() for inp in self.inputs],
+                      [out.to_list() for out in self.outputs]])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        @param data: A transaction encoded by to_bytes
+        @type data: bytes
+        @return: The decoded transaction
+        @rtype: Transaction
+        """
+        fields = unpack_fields(data, 13, "transaction")
+        try:
+            tx = cls.__new__(cls)
+            tx.txid = bytes_to_hex(fields[0])
+            tx.version, tx.lockTime = fields[1:3]
+            tx.blockHash = bytes_to_hex(fields[3])
+            tx.blockHeight, tx.confirmations = fields[4:6]
+            tx.timestamp = fields[6]
+            tx.time = timestamp_to_datetime(tx.timestamp)
+            tx.valueOut = satoshi_to_bitcoin(fields[7])
+            tx.size = fields[8]
+            tx.valueIn = satoshi_to_bitcoin(fields[9])
+            tx.fees = satoshi_to_bitcoin(fields[10])
+            tx.inputs = [TransactionInput.from_list(inp) for inp in fields[11]]
+            tx.outputs = [TransactionOutput.from_list(out) for out in fields[12]]
+        except DECODING_ERRORS:
+            raise ParamException("The given data is not an encoded transaction")
+        return tx
+
     def gain_for_address(self, address):
         """
         This method allows to get the gain of a specific address for this transaction
@@ -27,4 +27,4 @@ def bitcoin_to_satoshi(bitcoins):
     @return: The converted value
     @rtype: Intr
     """
-    return int(bitcoins * 100000000)
+    return int(round(bitcoins * 100000000))
@@ -25,5 +25,9 @@ setup(
         "Programming Language :: Python :: 2.7",
         "Topic :: Utilities",
         "License :: OSI Approved :: GNU General Public License v3 (GPLv3)",
-    ], requires=['requests']
+    ], requires=['requests'],
+    extras_require={
+        'msgpack': ['msgpack'],
+        'subscriptions': ['python-socketio>=4,<5', 'python-engineio<4'],
+    }
 )
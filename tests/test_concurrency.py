@@ -0,0 +1,49 @@
+# -*- coding:Utf-8 -*
+"""
+@author: Thibault de Balthasar
+@contact: contact (at) thibaultdebalt [.] fr
+@license: GNU GENERAL PUBLIC LICENSE Version 3
+"""
+
+import unittest
+
+from insight_pyclient.concurrency import AdaptiveConcurrencyLimiter
+
+
+class AdaptiveConcurrencyLimiterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+
+    def acquire(self):
+        # Every request seems to last 10ms, so that the latency stays healthy
+        return self.limiter.acquire() - 0.01
+
+    def test_sequential_requests_do_not_raise_the_limit(self):
+        for _ in range(500):
+            self.limiter.release(self.acquire())
+        self.assertEqual(self.limiter.limit, 4)
+
+    def test_full_windows_raise_the_limit(self):
+        for _ in range(10):
+            started = [self.acquire() for _ in range(self.limiter.limit)]
+            for start in started:
+                self.limiter.release(start)
+        self.assertTrue(self.limiter.limit > 4)
+        self.assertEqual(self.limiter.in_flight, 0)
+
+    def test_partly_used_windows_do_not_raise_the_limit(self):
+        for _ in range(50):
+            started = [self.acquire() for _ in range(self.limiter.limit - 1)]
+            for start in started:
+                self.limiter.release(start)
+        self.assertEqual(self.limiter.limit, 4)
+
+    def test_overload_halves_the_limit(self):
+        self.limiter.release(self.acquire(), overloaded=True)
+        self.assertEqual(self.limiter.limit, 2)
+        self.assertEqual(self.limiter.decisions[-1][1:], (4, 2, "overloaded"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+# -*- coding:Utf-8 -*
+"""
+Drives a ConfirmationTracker with a stand-in API, no network is used.
+
+@author: Thibault de Balthasar
+@contact: contact (at) thibaultdebalt [.] fr
+@license: GNU GENERAL PUBLIC LICENSE Version 3
+"""
+
+import threading
+import unittest
+
+from insight_pyclient.confirmation import ConfirmationTracker
+
+
+def is_free(lock):
+    """
+    Tells if the lock can be taken by another thread
+    """
+    free = []
+
+    def try_lock():
+        free.append(lock.acquire(False))
+        if free[0]:
+            lock.release()
+
+    thread = threading.Thread(target=try_lock)
+    thread.start()
+    thread.join()
+    return free[0]
+
+
+class FakeBlock(object):
+
+    def __init__(self, block_hash, height, previous_hash, txids):
+        self.hash = block_hash
+        self.height = height
+        self.previousBlockHash = previous_hash
+        self.tx = txids
+        self.isMainChain = True
+
+
+class FakeTransaction(object):
+
+    def __init__(self, txid, height):
+        self.txid = txid
+        self.blockHeight = height
+
+
+class FakeApi(object):
+    """
+    Gives the blocks added with add_block, the tip being the last one added
+    """
+
+    def __init__(self):
+        self.blocks = {}
+        self.tip = None
+        self.bulk_calls = []
+        self.tracker = None
+
+    def add_block(self, block_hash, height, previous_hash, txids=()):
+        self.blocks[block_hash] = FakeBlock(block_hash, height, previous_hash, list(txids))
+        self.tip = block_hash
+
+    def mine(self, prefix, start, end, txids=None):
+        for height in range(start, end + 1):
+            self.add_block(prefix + str(height), height, prefix + str(height - 1), (txids or {}).get(height, ()))
+
+    def get_last_block_hash(self):
+        return self.tip
+
+    def get_block(self, block_hash):
+        return self.blocks[block_hash]
+
+    def _height_of(self, txid):
+        height = None
+        block = self.blocks.get(self.tip)
+        while block is not None:
+            if txid in block.tx:
+                height = block.height
+            block = self.blocks.get(block.previousBlockHash)
+        return height
+
+    def get_transaction(self, txid):
+        return FakeTransaction(txid, self._height_of(txid))
+
+    def get_transactions(self, txids):
+        self.bulk_calls.append((list(txids), is_free(self.tracker._lock)))
+        return [self.get_transaction(txid) for txid in txids]
+
+
+class ConfirmationTrackerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeApi()
+        self.api.mine('a', 1, 10)
+        self.tracker = ConfirmationTracker(self.api, thresholds=(1, 3), max_depth=5, forget_settled=False)
+        self.api.tracker = self.tracker
+        self.confirmations = []
+        self.reorgs = []
+        self.tracker.on_confirmation(lambda txid, threshold, count: self.confirmations.append((txid, threshold)))
+        self.tracker.on_reorg(lambda txid, height: self.reorgs.append((txid, height)))
+
+    def test_thresholds(self):
+        self.tracker.track('t1')
+        self.api.mine('a', 11, 13, {11: ['t1']})
+        self.tracker.poll()
+        self.assertEqual(self.tracker.get_confirmations('t1'), 3)
+        self.assertEqual(self.confirmations, [('t1', 1), ('t1', 3)])
+
+    def test_reorg(self):
+        self.tracker.track('t1')
+        self.api.mine('a', 11, 11, {11: ['t1']})
+        self.tracker.poll()
+        self.api.add_block('b11', 11, 'a10')
+        self.api.add_block('b12', 12, 'b11', ['t1'])
+        self.tracker.poll()
+        self.assertEqual(self.reorgs, [('t1', 11)])
+        self.assertEqual(self.tracker.get_confirmations('t1'), 1)
+
+    def test_reload_loads_in_bulk_without_the_lock(self):
+        self.tracker.track('t1')
+        self.tracker.track('t2')
+        self.api.mine('a', 11, 20, {12: ['t1']})
+        self.tracker.poll()
+        self.assertEqual(self.api.bulk_calls, [(['t1', 't2'], True)])
+        self.assertEqual(self.tracker.get_confirmations('t1'), 9)
+        self.assertEqual(self.tracker.get_confirmations('t2'), 0)
+        self.assertEqual(self.confirmations, [('t1', 1), ('t1', 3)])
+
+    def test_callbacks_are_called_without_the_lock(self):
+        free = []
+        self.tracker.on_confirmation(lambda txid, threshold, count: free.append(is_free(self.tracker._lock)))
+        self.api.mine('a', 11, 11, {11: ['t1']})
+        self.tracker.track('t1')
+        self.assertEqual(free, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
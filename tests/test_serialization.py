@@ -0,0 +1,76 @@
+# -*- coding:Utf-8 -*
+"""
+@author: Thibault de Balthasar
+@contact: contact (at) thibaultdebalt [.] fr
+@license: GNU GENERAL PUBLIC LICENSE Version 3
+"""
+
+import json
+import pickle
+import unittest
+
+from insight_pyclient.address import Address, UnspentOutput
+from insight_pyclient.block import Block
+from insight_pyclient.exception import ParamException
+from insight_pyclient.serialization import packb, unpackb
+from insight_pyclient.transaction import Transaction
+
+TRANSACTION = json.dumps({
+    "txid": "ff" * 32, "version": 1, "locktime": 0, "blockhash": "00" * 32, "blockheight": 500000,
+    "confirmations": 3, "time": 1500000000, "valueOut": 0.0002, "size": 226, "valueIn": 0.0003, "fees": 0.0001,
+    "vin": [{"txid": "ab" * 32, "vout": 0, "sequence": 4294967295, "n": 0, "addr": "1A", "valueSat": 30000,
+             "value": 0.0003, "doubleSpentTxID": None, "scriptSig": {"asm": "3045 02ab", "hex": "483045"}}],
+    "vout": [{"value": "0.00020000", "n": 0, "scriptPubKey": {"hex": "76a914", "asm": "OP_DUP", "addresses": ["1B"],
+                                                              "type": "pubkeyhash"}}],
+})
+
+BLOCK = json.dumps({
+    "hash": "00" * 32, "size": 285, "height": 2, "version": 1, "tx": ["ab" * 32], "time": 1231469744, "nonce": 1,
+    "bits": "1d00ffff", "difficulty": 1.0, "chainwork": "0300030003", "confirmations": 1, "reward": 50.0,
+    "isMainChain": True, "previousblockhash": "01" * 32,
+})
+
+ADDRESS = json.dumps({
+    "addrStr": "1A", "balance": 0.5, "balanceSat": 50000000, "totalReceived": 1.0, "totalReceivedSat": 100000000,
+    "totalSent": 0.5, "totalSentSat": 50000000, "unconfirmedBalance": 0, "unconfirmedBalanceSat": 0,
+    "unconfirmedTxApperances": 0, "txApperances": 2, "transactions": ["ab" * 32, "cd" * 32],
+})
+
+UNSPENT_OUTPUT = {"address": "1A", "txid": "ab" * 32, "vout": 1, "scriptPubKey": "76a914", "amount": 0.1,
+                  "satoshis": 10000000, "confirmations": 6, "ts": 1500000000, "height": 500000}
+
+
+def fields_of(obj):
+    if hasattr(obj, "__slots__"):
+        return dict((name, fields_of(getattr(obj, name))) for name in obj.__slots__)
+    if isinstance(obj, list):
+        return [fields_of(item) for item in obj]
+    return obj
+
+
+class SerializationTest(unittest.TestCase):
+
+    def models(self):
+        return [Transaction(TRANSACTION), Block(BLOCK), Block(), Address(ADDRESS), UnspentOutput(UNSPENT_OUTPUT)]
+
+    def test_to_bytes_round_trip(self):
+        for model in self.models():
+            self.assertEqual(fields_of(type(model).from_bytes(model.to_bytes())), fields_of(model))
+
+    def test_pickle_round_trip(self):
+        for model in self.models():
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                self.assertEqual(fields_of(pickle.loads(pickle.dumps(model, protocol))), fields_of(model))
+
+    def test_invalid_data(self):
+        for data in [b"\xa1\xff", b"\xc1", b"\x92\x01", b"\x01\x02"]:
+            self.assertRaises(ParamException, unpackb, data)
+
+    def test_wrong_shape(self):
+        for cls in [Transaction, Block, Address, UnspentOutput]:
+            for value in [5, [1, 2], None, [None] * 19, ["x"] * 13, ["x"] * 8]:
+                self.assertRaises(ParamException, cls.from_bytes, packb(value))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+# -*- coding:Utf-8 -*
+"""
+Drives an InsightSubscriber with a stand-in socket.io client and a stand-in API, no network is used.
+
+@author: Thibault de Balthasar
+@contact: contact (at) thibaultdebalt [.] fr
+@license: GNU GENERAL PUBLIC LICENSE Version 3
+"""
+
+import unittest
+
+from insight_pyclient.exception import APIException
+from insight_pyclient.subscription import InsightSubscriber, ADDRESS_EVENT
+
+
+class FakeBlock(object):
+
+    def __init__(self, block_hash, height):
+        self.hash = block_hash
+        self.height = height
+
+
+class FakeApi(object):
+    """
+    A chain of blocks named b0, b1..., the requests fail while failing is True
+    """
+
+    address = 'http://insight.local/api/'
+
+    def __init__(self, height):
+        self.height = height
+        self.failing = False
+
+    def _check(self):
+        if self.failing:
+            raise APIException("Wrong status code", 503, "", "")
+
+    def get_last_block_hash(self):
+        self._check()
+        return 'b' + str(self.height)
+
+    def get_block(self, block_hash):
+        self._check()
+        return FakeBlock(block_hash, int(block_hash[1:]))
+
+    def get_block_hash(self, height):
+        self._check()
+        return 'b' + str(height)
+
+
+class FakeClient(object):
+    """
+    Stands for a python-socketio client connected to the server, the server side is simulated with receive
+    """
+
+    def __init__(self):
+        self.handlers = {}
+        self.emitted = []
+        self.connected = False
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def connect(self, url):
+        self.url = url
+        self.connected = True
+        self.handlers['connect']()
+
+    def emit(self, event, data=None):
+        self.emitted.append((event, data))
+
+    def wait(self):
+        pass
+
+    def disconnect(self):
+        self.connected = False
+        self.handlers['disconnect']()
+
+    def receive(self, event, data):
+        self.handlers[event](data)
+
+
+class InsightSubscriberTest(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeApi(10)
+        self.client = FakeClient()
+        self.subscriber = InsightSubscriber(self.api, client=self.client)
+        self.blocks = []
+        self.subscriber.on_block(self.blocks.append)
+
+    def mine(self, count=1):
+        for _ in range(count):
+            self.api.height += 1
+            self.client.receive('block', 'b' + str(self.api.height))
+
+    def test_connect_subscribes(self):
+        self.subscriber.watch_address('1A')
+        self.subscriber.connect()
+        self.assertEqual(self.client.url, 'http://insight.local')
+        self.assertEqual(self.client.emitted, [('subscribe', 'inv'), ('subscribe', (ADDRESS_EVENT, ['1A']))])
+
+    def test_watch_and_unwatch_while_connected(self):
+        addresses = []
+        self.subscriber.connect()
+        self.subscriber.watch_address('1A', lambda address, txid: addresses.append((address, txid)))
+        self.client.receive(ADDRESS_EVENT, {"address": '1A', "txid": 't1'})
+        self.subscriber.unwatch_address('1A')
+        self.client.receive(ADDRESS_EVENT, {"address": '1A', "txid": 't2'})
+        self.assertEqual(addresses, [('1A', 't1')])
+        self.assertEqual(self.client.emitted[1:], [('subscribe', (ADDRESS_EVENT, ['1A'])),
+                                                   ('unsubscribe', (ADDRESS_EVENT, ['1A']))])
+
+    def test_duplicate_blocks_are_given_once(self):
+        self.subscriber.connect()
+        self.mine()
+        self.client.receive('block', 'b11')
+        self.assertEqual(self.blocks, ['b11'])
+
+    def test_reconnect_backfills_and_resubscribes(self):
+        self.subscriber.watch_address('1A')
+        self.subscriber.connect()
+        self.mine()
+        self.client.disconnect()
+        self.api.height += 3
+        del self.client.emitted[:]
+        self.client.connect(self.subscriber.url)
+        self.assertEqual(self.blocks, ['b11', 'b12', 'b13', 'b14'])
+        self.assertEqual(self.client.emitted, [('subscribe', 'inv'), ('subscribe', (ADDRESS_EVENT, ['1A']))])
+
+    def test_backfill_disabled(self):
+        self.subscriber.backfill = False
+        self.subscriber.connect()
+        self.client.disconnect()
+        self.api.height += 2
+        self.client.connect(self.subscriber.url)
+        self.mine()
+        self.assertEqual(self.blocks, ['b13'])
+
+    def test_failed_backfill_is_retried_on_next_block(self):
+        self.subscriber.connect()
+        self.client.disconnect()
+        self.api.height += 2
+        self.api.failing = True
+        self.client.connect(self.subscriber.url)
+        self.mine()
+        self.assertEqual(self.blocks, ['b13'])
+        self.api.failing = False
+        self.mine()
+        self.assertEqual(self.blocks, ['b13', 'b11', 'b12', 'b14'])
+        self.mine()
+        self.assertEqual(self.blocks[-1], 'b15')
+
+    def test_failed_backfill_is_retried_on_next_connect(self):
+        self.subscriber.connect()
+        self.client.disconnect()
+        self.api.height += 2
+        self.api.failing = True
+        self.client.connect(self.subscriber.url)
+        self.client.disconnect()
+        self.api.failing = False
+        self.client.connect(self.subscriber.url)
+        self.assertEqual(self.blocks, ['b11', 'b12'])
+
+    def test_events_are_kept_from_the_call(self):
+        self.subscriber.connect()
+        events = self.subscriber.events()
+        self.mine()
+        self.client.receive('tx', {"txid": 't1'})
+        self.assertEqual(next(events), ('block', 'b11'))
+        self.assertEqual(next(events), ('tx', {"txid": 't1'}))
+
+    def test_each_iterator_gets_every_event(self):
+        self.subscriber.connect()
+        first = self.subscriber.events()
+        with self.subscriber.events() as second:
+            self.mine()
+            self.assertEqual(next(first), ('block', 'b11'))
+            self.assertEqual(next(second), ('block', 'b11'))
+        self.assertEqual(len(self.subscriber._queues), 1)
+        first.close()
+        self.assertEqual(self.subscriber._queues, [])
+        self.assertRaises(StopIteration, next, first)
+
+
+if __name__ == '__main__':
+    unittest.main()